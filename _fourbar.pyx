@@ -0,0 +1,158 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True, language_level=3
+"""
+_fourbar.pyx
+
+Compiled version of the closed-form crank sweep in solver.py.
+
+All angles and trig terms are produced in a single C loop
+(one assembly branch, toggle positions skipped), with the
+same output dictionary as compute_four_bar.
+
+This extension is OPTIONAL. Build it with:
+    python setup.py build_ext --inplace
+
+solver.py falls back to the NumPy path if it is not built.
+"""
+
+import numpy as np
+
+from libc.math cimport sin, cos, sqrt, atan2, acos, hypot, floor, ceil, M_PI
+
+
+cdef inline double wrap_angle(double angle):
+    # Wraps an angle difference into [-pi, pi)
+    return angle - 2.0 * M_PI * floor((angle + M_PI) / (2.0 * M_PI))
+
+
+cpdef dict fourbar_sweep(
+    double L1,
+    double L2,
+    double L3,
+    double L4,
+    double step,
+    double omega,
+    bint crossed=False
+):
+    """
+    Sweeps the input crank over one full revolution.
+
+    Parameters:
+    ----------
+    L1, L2, L3, L4 : float
+        Link lengths
+
+    step : float
+        Input angle step size (radians)
+
+    omega : float
+        Input crank speed (rad/s)
+
+    crossed : bool, optional
+        Follow the crossed branch instead of the open one
+
+    Returns:
+    -------
+    data : dict
+        Same keys as solver.compute_four_bar
+    """
+
+    # Same samples as np.arange(1e-3, 2*pi + 1e-12, step)
+    cdef double theta2_start = 1e-3
+    cdef double dt = step / omega
+    cdef Py_ssize_t n = <Py_ssize_t>ceil(
+        (2.0 * M_PI + 1e-12 - theta2_start) / step
+    )
+
+    time_arr = np.empty(n)
+    theta2_arr = np.empty(n)
+    theta3_arr = np.empty(n)
+    theta4_arr = np.empty(n)
+    c2_arr = np.empty(n)
+    s2_arr = np.empty(n)
+    c3_arr = np.empty(n)
+    s3_arr = np.empty(n)
+    c4_arr = np.empty(n)
+    s4_arr = np.empty(n)
+
+    cdef double[::1] time_v = time_arr
+    cdef double[::1] theta2_v = theta2_arr
+    cdef double[::1] theta3_v = theta3_arr
+    cdef double[::1] theta4_v = theta4_arr
+    cdef double[::1] c2_v = c2_arr
+    cdef double[::1] s2_v = s2_arr
+    cdef double[::1] c3_v = c3_arr
+    cdef double[::1] s3_v = s3_arr
+    cdef double[::1] c4_v = c4_arr
+    cdef double[::1] s4_v = s4_arr
+
+    cdef Py_ssize_t k
+    cdef Py_ssize_t count = 0
+    cdef double theta2, theta3, theta4
+    cdef double c2, s2, c4, s4
+    cdef double r, beta, cos_gamma, x3, y3, r3
+
+    for k in range(n):
+
+        theta2 = theta2_start + k * step
+        c2 = cos(theta2)
+        s2 = sin(theta2)
+
+        # Length of diagonal BD
+        r = sqrt(L1 * L1 + L2 * L2 - 2.0 * L1 * L2 * c2)
+        if r == 0.0:
+            continue
+
+        # Law of cosines in triangle B-C-D
+        cos_gamma = (L4 * L4 + r * r - L3 * L3) / (2.0 * L4 * r)
+        if cos_gamma < -1.0 or cos_gamma > 1.0:
+            # Toggle / singular position: skip step
+            continue
+
+        # Open (-gamma) or crossed (+gamma) configuration
+        beta = atan2(L2 * s2, L1 - L2 * c2)
+        if crossed:
+            theta4 = M_PI - beta + acos(cos_gamma)
+        else:
+            theta4 = M_PI - beta - acos(cos_gamma)
+        c4 = cos(theta4)
+        s4 = sin(theta4)
+
+        # Coupler vector B -> C
+        x3 = L1 + L4 * c4 - L2 * c2
+        y3 = L4 * s4 - L2 * s2
+        r3 = hypot(x3, y3)
+        theta3 = atan2(y3, x3)
+
+        # Keep angles continuous (no 2*pi jumps)
+        if count > 0:
+            theta3 = theta3_v[count - 1] + wrap_angle(
+                theta3 - theta3_v[count - 1]
+            )
+            theta4 = theta4_v[count - 1] + wrap_angle(
+                theta4 - theta4_v[count - 1]
+            )
+
+        time_v[count] = k * dt
+        theta2_v[count] = theta2
+        theta3_v[count] = theta3
+        theta4_v[count] = theta4
+        c2_v[count] = c2
+        s2_v[count] = s2
+        c3_v[count] = x3 / r3
+        s3_v[count] = y3 / r3
+        c4_v[count] = c4
+        s4_v[count] = s4
+        count += 1
+
+    return {
+        "time": time_arr[:count],
+        "theta2": theta2_arr[:count],
+        "theta3": theta3_arr[:count],
+        "theta4": theta4_arr[:count],
+        "cos_theta2": c2_arr[:count],
+        "sin_theta2": s2_arr[:count],
+        "cos_theta3": c3_arr[:count],
+        "sin_theta3": s3_arr[:count],
+        "cos_theta4": c4_arr[:count],
+        "sin_theta4": s4_arr[:count],
+    }
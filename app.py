@@ -1,10 +1,126 @@
-from flask import Flask, render_template, request, jsonify
+import math
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 
-from solver import compute_four_bar
+import numpy as np
+import orjson
+from flask import Flask, g, render_template, request, jsonify
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
+
+from solver import check_grashof, compute_four_bar
 from geometry import compute_geometry
 from dynamics import compute_kinematics
 
+# Optional Numba-compiled pipeline
+try:
+    from dynamics_fast import compute_geometry_kinematics
+except ImportError:
+    compute_geometry_kinematics = None
+
+
+# -------------------------------------------
+# JSON provider (orjson)
+# -------------------------------------------
+class OrjsonProvider(JSONProvider):
+    """
+    Serializes responses with orjson.
+
+    C-contiguous NumPy arrays are encoded directly (no .tolist()),
+    so jsonify() accepts them as-is; orjson rejects non-contiguous
+    views (slice with a step, transposes), pass a copy instead.
+    """
+
+    option = orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj, **kwargs):
+        option = self.option
+        if kwargs.pop("sort_keys", False):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.pop("indent", None):
+            option |= orjson.OPT_INDENT_2
+
+        default = kwargs.pop("default", None)
+        if kwargs:
+            raise TypeError(
+                "Unsupported orjson dumps arguments: " + ", ".join(kwargs)
+            )
+
+        return orjson.dumps(obj, default=default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+# Accepted crank step range (degrees):
+# below MIN the sweep becomes huge, above MAX too few samples remain
+MIN_STEP_DEG = 0.1
+MAX_STEP_DEG = 90.0
+
+# Accepted link length and crank speed ranges:
+# keeps positions, velocities and accelerations finite in float32
+MIN_LENGTH = 1e-3
+MAX_LENGTH = 1e3
+MIN_RPM = 0.01
+MAX_RPM = 1e4
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+
+# -------------------------------------------
+# Compressed response cache (Flask-Compress backend)
+# -------------------------------------------
+class CompressedCache:
+    """
+    Small thread-safe LRU store for compressed bodies.
+
+    Lets warm /solve hits skip brotli/gzip as well as
+    the solver (one entry per parameter tuple and algorithm).
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+def compress_cache_key(req):
+    """
+    Cache key for a compressed response: the normalized
+    /solve parameter tuple, or method, path, query
+    string and body of any other request.
+    """
+
+    key = g.get("compress_cache_key")
+    if key is None:
+        key = " ".join(
+            (req.method, req.full_path, req.get_data(as_text=True))
+        )
+    return key
+
+
+# Compress JSON responses (brotli, gzip fallback)
+app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.config["COMPRESS_CACHE_BACKEND"] = CompressedCache
+app.config["COMPRESS_CACHE_KEY"] = compress_cache_key
+Compress(app)
 
 
 # -------------------------------------------
@@ -15,43 +131,103 @@ def index():
     return render_template("index.html")
 
 
+# -------------------------------------------
+# Full pipeline, cached by parameter tuple
+# -------------------------------------------
+@lru_cache(maxsize=256)
+def _solve_cached(L1, L2, L3, L4, step_deg, rpm):
+    """
+    Runs solver, geometry and kinematics and returns
+    the serialized JSON body (bytes), or None if the
+    linkage cannot be assembled at any crank angle.
+
+    The pipeline is deterministic in its inputs, so
+    repeated requests reuse the stored response.
+    """
+
+    # Run kinematic solver
+    data = compute_four_bar(L1, L2, L3, L4, step_deg, rpm)
+
+    if len(data["time"]) == 0:
+        return None
+
+    if compute_geometry_kinematics is not None:
+        # Compiled geometry + velocity & acceleration in one pass
+        geom, kin = compute_geometry_kinematics(data, L1, L2, L3)
+    else:
+        # Compute geometry
+        geom = compute_geometry(data, L1, L2, L3)
+
+        # Compute velocity & acceleration of coupler point
+        kin = compute_kinematics(geom["Px"], geom["Py"], data["time"])
+
+    # Struct-of-arrays response: one 1D array per coordinate
+    # Computation stays float64; float32 is enough for plotting
+    payload = {
+        key: value.astype(np.float32)
+        for key, value in {"time": data["time"], **geom, **kin}.items()
+    }
+
+    return orjson.dumps(payload, option=OrjsonProvider.option)
+
+
+# -------------------------------------------
+# Input normalization for the cache key
+# -------------------------------------------
+def round_sig(x, digits=6):
+    """
+    Rounds x to a fixed number of significant figures
+    so that equivalent inputs share one cache entry.
+    """
+
+    return float(f"{x:.{digits}g}")
+
+
 # -------------------------------------------
 # Solve four-bar and return data
 # -------------------------------------------
 @app.route("/solve", methods=["POST"])
 def solve():
 
-    params = request.json
+    params = request.get_json(silent=True)
 
-    L1 = float(params["L1"])
-    L2 = float(params["L2"])
-    L3 = float(params["L3"])
-    L4 = float(params["L4"])
+    # Validate inputs before touching the solver
+    try:
+        L1 = round_sig(float(params["L1"]))
+        L2 = round_sig(float(params["L2"]))
+        L3 = round_sig(float(params["L3"]))
+        L4 = round_sig(float(params["L4"]))
 
-    step_deg = float(params.get("step_deg", 1))
-    rpm = float(params.get("rpm", 30.0))
+        step_deg = round_sig(float(params.get("step_deg", 1)))
+        rpm = round_sig(float(params.get("rpm", 30.0)))
+    except (TypeError, KeyError, ValueError, AttributeError):
+        return jsonify({"error": "invalid-params"}), 400
 
-    # Run kinematic solver
-    data = compute_four_bar(L1, L2, L3, L4, step_deg, rpm)
+    values = (L1, L2, L3, L4, step_deg, rpm)
+    if not all(math.isfinite(v) and v > 0 for v in values):
+        return jsonify({"error": "invalid-params"}), 400
+
+    if not MIN_STEP_DEG <= step_deg <= MAX_STEP_DEG:
+        return jsonify({"error": "invalid-params"}), 400
+
+    if not all(MIN_LENGTH <= v <= MAX_LENGTH for v in (L1, L2, L3, L4)):
+        return jsonify({"error": "invalid-params"}), 400
+
+    if not MIN_RPM <= rpm <= MAX_RPM:
+        return jsonify({"error": "invalid-params"}), 400
+
+    # Non-Grashof mechanisms cannot complete a crank revolution
+    if not check_grashof(L1, L2, L3, L4):
+        return jsonify({"error": "non-grashof"}), 400
+
+    body = _solve_cached(*values)
+    if body is None:
+        return jsonify({"error": "no-valid-positions"}), 400
+
+    # Compressed body is cached under the same parameter tuple
+    g.compress_cache_key = "/solve" + repr(values)
 
-    # Compute geometry
-    geom = compute_geometry(data, L1, L2, L3)
-
-    # Compute velocity & acceleration of coupler point
-    kin = compute_kinematics(geom["P"], data["time"])
-
-    return jsonify({
-        "time": data["time"].tolist(),
-        "A": geom["A"].tolist(),
-        "B": geom["B"].tolist(),
-        "C": geom["C"].tolist(),
-        "D": geom["D"].tolist(),
-        "P": geom["P"].tolist(),
-        "vx": kin["vx"].tolist(),
-        "vy": kin["vy"].tolist(),
-        "ax": kin["ax"].tolist(),
-        "ay": kin["ay"].tolist(),
-    })
+    return app.response_class(body, mimetype="application/json")
 
 
 if __name__ == "__main__":
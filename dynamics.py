@@ -32,28 +32,29 @@ def compute_velocity(pos, time):
     Parameters:
     ----------
     pos : numpy.ndarray
-        Position array of shape (N, 2)
+        Position array of shape (N,) or (N, 2), N >= 2
         pos[:,0] -> x
         pos[:,1] -> y
 
     time : numpy.ndarray
-        Time array of shape (N,)
+        Time array of shape (N,), spacing may be non-uniform
 
     Returns:
     -------
     vel : numpy.ndarray
-        Velocity array of shape (N, 2)
+        Velocity array (same shape as pos)
     """
 
-    N = len(time)
     vel = np.zeros_like(pos)
 
     # Forward difference (first point)
     vel[0] = (pos[1] - pos[0]) / (time[1] - time[0])
 
-    # Central difference (interior points)
-    for i in range(1, N - 1):
-        vel[i] = (pos[i + 1] - pos[i - 1]) / (time[i + 1] - time[i - 1])
+    # Central difference (interior points, vectorized)
+    # (dt reshaped to broadcast over (N,) or (N, 2) data)
+    dt = time[2:] - time[:-2]
+    dt = dt.reshape((-1,) + (1,) * (pos.ndim - 1))
+    vel[1:-1] = (pos[2:] - pos[:-2]) / dt
 
     # Backward difference (last point)
     vel[-1] = (pos[-1] - pos[-2]) / (time[-1] - time[-2])
@@ -72,26 +73,27 @@ def compute_acceleration(vel, time):
     Parameters:
     ----------
     vel : numpy.ndarray
-        Velocity array of shape (N, 2)
+        Velocity array of shape (N,) or (N, 2), N >= 2
 
     time : numpy.ndarray
-        Time array of shape (N,)
+        Time array of shape (N,), spacing may be non-uniform
 
     Returns:
     -------
     acc : numpy.ndarray
-        Acceleration array of shape (N, 2)
+        Acceleration array (same shape as vel)
     """
 
-    N = len(time)
     acc = np.zeros_like(vel)
 
     # Forward difference (first point)
     acc[0] = (vel[1] - vel[0]) / (time[1] - time[0])
 
-    # Central difference (interior points)
-    for i in range(1, N - 1):
-        acc[i] = (vel[i + 1] - vel[i - 1]) / (time[i + 1] - time[i - 1])
+    # Central difference (interior points, vectorized)
+    # (dt reshaped to broadcast over (N,) or (N, 2) data)
+    dt = time[2:] - time[:-2]
+    dt = dt.reshape((-1,) + (1,) * (vel.ndim - 1))
+    acc[1:-1] = (vel[2:] - vel[:-2]) / dt
 
     # Backward difference (last point)
     acc[-1] = (vel[-1] - vel[-2]) / (time[-1] - time[-2])
@@ -99,18 +101,198 @@ def compute_acceleration(vel, time):
     return acc
 
 
+# --------------------------------------------------
+# Adaptive velocity (validation reference)
+# --------------------------------------------------
+def compute_velocity_adaptive(pos_fn, time, h0=None, rtol=1e-8, max_iter=8):
+    """
+    Computes velocity of a position FUNCTION with adaptive
+    central differences and Richardson extrapolation.
+
+    Each iteration halves the step h and makes a single
+    vectorized call to pos_fn on the stacked grid
+    [time + h, time - h]. Iteration stops once every
+    point has converged to rtol.
+
+    Intended for validating the fixed-step kernels
+    (compute_velocity / compute_kinematics_fused).
+
+    Parameters:
+    ----------
+    pos_fn : callable
+        Maps a time array (M,) to positions (M,) or (M, 2)
+
+    time : numpy.ndarray
+        Time array of shape (N,)
+
+    h0 : float, optional
+        Initial step (default: first grid spacing)
+
+    rtol : float, optional
+        Relative tolerance for convergence
+
+    max_iter : int, optional
+        Maximum number of step halvings
+
+    Returns:
+    -------
+    vel : numpy.ndarray
+        Velocity array, shape of pos_fn(time)
+
+    err : numpy.ndarray
+        Error estimate for every entry of vel
+    """
+
+    time = np.asarray(time, dtype=float)
+    N = len(time)
+
+    if h0 is None:
+        h0 = time[1] - time[0] if N > 1 else 1e-3
+
+    h = h0
+    prev_row = None
+    vel = None
+    err = None
+
+    for k in range(max_iter):
+
+        # One function call per iteration
+        pos = np.asarray(pos_fn(np.concatenate((time + h, time - h))))
+
+        # Richardson table row: central difference, then extrapolations
+        row = [(pos[:N] - pos[N:]) / (2.0 * h)]
+        for j in range(1, k + 1):
+            factor = 4.0**j
+            row.append(
+                (factor * row[j - 1] - prev_row[j - 1]) / (factor - 1.0)
+            )
+
+        if k == 0:
+            vel = row[0]
+            err = np.full_like(vel, np.inf)
+        else:
+            # Keep the best estimate found so far at every point
+            estimate = row[-1]
+            estimate_err = np.abs(row[-1] - prev_row[-1])
+            better = estimate_err < err
+            vel = np.where(better, estimate, vel)
+            err = np.where(better, estimate_err, err)
+
+            if np.all(err <= rtol * (1.0 + np.abs(vel))):
+                break
+
+        prev_row = row
+        h *= 0.5
+
+    return vel, err
+
+
+# --------------------------------------------------
+# Uniform grid check
+# --------------------------------------------------
+def uniform_time_step(time, rtol=1e-9):
+    """
+    Returns the time step if the grid is uniform.
+
+    The spacing is compared RELATIVE to the first step,
+    so tiny steps (high rpm) are not mistaken for uniform
+    when toggle steps were skipped.
+
+    Parameters:
+    ----------
+    time : numpy.ndarray
+        Time array of shape (N,)
+
+    rtol : float, optional
+        Relative tolerance on the spacing
+
+    Returns:
+    -------
+    float or None
+        Uniform step dt, or None if N < 3 or the
+        grid has gaps
+    """
+
+    if len(time) < 3:
+        return None
+
+    dt = time[1] - time[0]
+    if not np.allclose(np.diff(time), dt, rtol=rtol, atol=0.0):
+        return None
+
+    return dt
+
+
+# --------------------------------------------------
+# Compute velocity and acceleration in one pass
+# --------------------------------------------------
+def compute_kinematics_fused(pos, time):
+    """
+    Computes velocity and acceleration directly from
+    position data on a uniform time grid.
+
+    Acceleration uses the second-order central stencil
+        (pos[i+1] - 2 pos[i] + pos[i-1]) / dt^2
+    so no intermediate velocity array is differentiated.
+
+    Non-uniform grids (e.g. toggle steps skipped by the
+    solver) and short arrays (N < 3) fall back to
+    compute_velocity / compute_acceleration.
+
+    Parameters:
+    ----------
+    pos : numpy.ndarray
+        Position array of shape (N,) or (N, 2)
+
+    time : numpy.ndarray
+        Time array of shape (N,)
+
+    Returns:
+    -------
+    vel, acc : numpy.ndarray
+        Velocity and acceleration arrays (same shape as pos)
+    """
+
+    if len(time) < 2:
+        # Single sample: no motion information
+        return np.zeros_like(pos), np.zeros_like(pos)
+
+    # Uniform time step
+    dt = uniform_time_step(time)
+
+    if dt is None:
+        # Gaps in the grid: difference with the actual spacing
+        vel = compute_velocity(pos, time)
+        return vel, compute_acceleration(vel, time)
+
+    vel = np.empty_like(pos)
+    acc = np.empty_like(pos)
+
+    # Central differences (interior points)
+    vel[1:-1] = (pos[2:] - pos[:-2]) / (2.0 * dt)
+    acc[1:-1] = (pos[2:] - 2.0 * pos[1:-1] + pos[:-2]) / (dt * dt)
+
+    # One-sided differences (boundaries)
+    vel[0] = (pos[1] - pos[0]) / dt
+    vel[-1] = (pos[-1] - pos[-2]) / dt
+    acc[0] = (pos[2] - 2.0 * pos[1] + pos[0]) / (dt * dt)
+    acc[-1] = (pos[-1] - 2.0 * pos[-2] + pos[-3]) / (dt * dt)
+
+    return vel, acc
+
+
 # --------------------------------------------------
 # Compute full kinematic derivatives
 # --------------------------------------------------
-def compute_kinematics(pos, time):
+def compute_kinematics(x, y, time):
     """
     Convenience function that computes both
     velocity and acceleration.
 
     Parameters:
     ----------
-    pos : numpy.ndarray
-        Position array (N, 2)
+    x, y : numpy.ndarray
+        Position coordinate arrays (N,)
 
     time : numpy.ndarray
         Time array (N,)
@@ -123,12 +305,12 @@ def compute_kinematics(pos, time):
         - ax, ay
     """
 
-    vel = compute_velocity(pos, time)
-    acc = compute_acceleration(vel, time)
+    vx, ax = compute_kinematics_fused(x, time)
+    vy, ay = compute_kinematics_fused(y, time)
 
     return {
-        "vx": vel[:, 0],
-        "vy": vel[:, 1],
-        "ax": acc[:, 0],
-        "ay": acc[:, 1],
+        "vx": vx,
+        "vy": vy,
+        "ax": ax,
+        "ay": ay,
     }
@@ -0,0 +1,168 @@
+"""
+dynamics_fast.py
+
+Numba-compiled version of the geometry and
+kinematics pipeline (geometry.py + dynamics.py).
+
+Joint positions, velocity and acceleration of the
+coupler point are computed in fused loops without
+NumPy temporaries.
+
+This module is OPTIONAL:
+- It requires numba
+- app.py falls back to geometry.py / dynamics.py
+  when numba is not installed
+- Short or non-uniform time grids (toggle steps skipped)
+  are handed to geometry.py / dynamics.py as well
+
+Input  : Angle arrays (theta2, theta3) on a uniform time grid
+Output : Same dictionaries as compute_geometry / compute_kinematics
+"""
+
+import numpy as np
+from numba import njit, prange
+
+from geometry import compute_geometry
+from dynamics import compute_kinematics, uniform_time_step
+
+
+# --------------------------------------------------
+# Fused geometry + differencing kernel
+# --------------------------------------------------
+@njit(parallel=True, fastmath=True, cache=True)
+def compute_all(theta2, theta3, L1, L2, L3, dt, coupler_ratio=1.0):
+    """
+    Computes joint positions and coupler point kinematics.
+
+    Parameters:
+    ----------
+    theta2, theta3 : numpy.ndarray
+        Crank and coupler angles of shape (N,), N >= 3
+
+    L1, L2, L3 : float
+        Link lengths (ground, input, coupler)
+
+    dt : float
+        Uniform time step
+
+    coupler_ratio : float, optional
+        Location of the coupler point as a fraction of L3
+
+    Returns:
+    -------
+    Bx, By, Cx, Cy, Px, Py, vx, vy, ax, ay : numpy.ndarray
+        Struct-of-arrays output, each of shape (N,)
+    """
+
+    N = theta2.shape[0]
+    r = coupler_ratio * L3
+
+    Bx = np.empty(N)
+    By = np.empty(N)
+    Cx = np.empty(N)
+    Cy = np.empty(N)
+    Px = np.empty(N)
+    Py = np.empty(N)
+
+    # Joint positions
+    for i in prange(N):
+        c2 = np.cos(theta2[i])
+        s2 = np.sin(theta2[i])
+        c3 = np.cos(theta3[i])
+        s3 = np.sin(theta3[i])
+
+        Bx[i] = L2 * c2
+        By[i] = L2 * s2
+        Cx[i] = Bx[i] + L3 * c3
+        Cy[i] = By[i] + L3 * s3
+        Px[i] = Bx[i] + r * c3
+        Py[i] = By[i] + r * s3
+
+    vx = np.empty(N)
+    vy = np.empty(N)
+    ax = np.empty(N)
+    ay = np.empty(N)
+
+    inv_2dt = 0.5 / dt
+    inv_dt2 = 1.0 / (dt * dt)
+
+    # Central differences (interior points)
+    for i in prange(1, N - 1):
+        vx[i] = (Px[i + 1] - Px[i - 1]) * inv_2dt
+        vy[i] = (Py[i + 1] - Py[i - 1]) * inv_2dt
+        ax[i] = (Px[i + 1] - 2.0 * Px[i] + Px[i - 1]) * inv_dt2
+        ay[i] = (Py[i + 1] - 2.0 * Py[i] + Py[i - 1]) * inv_dt2
+
+    # One-sided differences (boundaries)
+    vx[0] = (Px[1] - Px[0]) / dt
+    vy[0] = (Py[1] - Py[0]) / dt
+    vx[N - 1] = (Px[N - 1] - Px[N - 2]) / dt
+    vy[N - 1] = (Py[N - 1] - Py[N - 2]) / dt
+    ax[0] = (Px[2] - 2.0 * Px[1] + Px[0]) * inv_dt2
+    ay[0] = (Py[2] - 2.0 * Py[1] + Py[0]) * inv_dt2
+    ax[N - 1] = (Px[N - 1] - 2.0 * Px[N - 2] + Px[N - 3]) * inv_dt2
+    ay[N - 1] = (Py[N - 1] - 2.0 * Py[N - 2] + Py[N - 3]) * inv_dt2
+
+    return Bx, By, Cx, Cy, Px, Py, vx, vy, ax, ay
+
+
+# --------------------------------------------------
+# Drop-in replacement for compute_geometry + compute_kinematics
+# --------------------------------------------------
+def compute_geometry_kinematics(data, L1, L2, L3, coupler_ratio=1.0):
+    """
+    Runs the compiled kernel and packs the results
+    in the same format as geometry.py and dynamics.py.
+
+    Parameters:
+    ----------
+    data : dict
+        Output dictionary from solver.py
+
+    L1, L2, L3 : float
+        Link lengths (ground, input, coupler)
+
+    coupler_ratio : float, optional
+        Location of the coupler point as a fraction of L3
+
+    Returns:
+    -------
+    geometry, kinematics : dict
+        Same dictionaries as compute_geometry and
+        compute_kinematics
+    """
+
+    time = data["time"]
+
+    # Kernel needs N >= 3 samples on a uniform grid
+    dt = uniform_time_step(time)
+    if dt is None:
+        geometry = compute_geometry(data, L1, L2, L3, coupler_ratio)
+        kinematics = compute_kinematics(geometry["Px"], geometry["Py"], time)
+        return geometry, kinematics
+
+    Bx, By, Cx, Cy, Px, Py, vx, vy, ax, ay = compute_all(
+        np.ascontiguousarray(data["theta2"], dtype=np.float64),
+        np.ascontiguousarray(data["theta3"], dtype=np.float64),
+        float(L1), float(L2), float(L3), dt, float(coupler_ratio)
+    )
+
+    geometry = {
+        "A": np.array([0.0, 0.0]),
+        "Bx": Bx,
+        "By": By,
+        "Cx": Cx,
+        "Cy": Cy,
+        "D": np.array([float(L1), 0.0]),
+        "Px": Px,
+        "Py": Py,
+    }
+
+    kinematics = {
+        "vx": vx,
+        "vy": vy,
+        "ax": ax,
+        "ay": ay,
+    }
+
+    return geometry, kinematics
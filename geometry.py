@@ -20,6 +20,8 @@ Coordinate System:
 - Motion is in the XY plane
 """
 
+from math import cos, sin
+
 import numpy as np
 
 
@@ -73,10 +75,10 @@ def joint_positions(theta2, theta3, L1, L2, L3):
 
     # Input link rotates about point A
     # Polar-to-Cartesian conversion
-    B = np.array([
-        L2 * np.cos(theta2),
-        L2 * np.sin(theta2)
-    ])
+    # (math.cos/sin: scalar inputs, no ufunc dispatch)
+    B = np.empty(2)
+    B[0] = L2 * cos(theta2)
+    B[1] = L2 * sin(theta2)
 
     # -------------------------------
     # Coupler link (B -> C)
@@ -84,10 +86,9 @@ def joint_positions(theta2, theta3, L1, L2, L3):
 
     # Coupler link extends from joint B
     # Orientation given by theta3
-    C = B + np.array([
-        L3 * np.cos(theta3),
-        L3 * np.sin(theta3)
-    ])
+    C = np.empty(2)
+    C[0] = B[0] + L3 * cos(theta3)
+    C[1] = B[1] + L3 * sin(theta3)
 
     return A, B, C, D
 
@@ -122,10 +123,9 @@ def coupler_point(B, theta3, r, phi=0.0):
     """
 
     # Coupler point position relative to joint B
-    P = B + np.array([
-        r * np.cos(theta3 + phi),
-        r * np.sin(theta3 + phi)
-    ])
+    P = np.empty(2)
+    P[0] = B[0] + r * cos(theta3 + phi)
+    P[1] = B[1] + r * sin(theta3 + phi)
 
     return P
 
@@ -146,6 +146,8 @@ def compute_geometry(data, L1, L2, L3, coupler_ratio=1.0):
         Output dictionary from solver.py containing:
         - data["theta2"]
         - data["theta3"]
+        Optional precomputed cos_theta2, sin_theta2,
+        cos_theta3, sin_theta3 are reused if present
 
     L1, L2, L3 : float
         Link lengths (ground, input, coupler)
@@ -157,51 +159,55 @@ def compute_geometry(data, L1, L2, L3, coupler_ratio=1.0):
     Returns:
     -------
     geometry : dict
-        Dictionary containing position arrays:
-        - A : (N, 2)
-        - B : (N, 2)
-        - C : (N, 2)
-        - D : (N, 2)
-        - P : (N, 2)  coupler point
+        Dictionary containing 1D coordinate arrays (N,)
+        (struct-of-arrays layout):
+        - Bx, By
+        - Cx, Cy
+        - Px, Py  coupler point
+        and the fixed ground joints as (2,) points:
+        - A
+        - D
+        (use np.broadcast_to(A, (N, 2)) for a zero-copy
+        per-step view; .copy() it before writing)
     """
 
-    # Lists are used first for efficiency,
-    # converted to NumPy arrays at the end
-    A_list = []
-    B_list = []
-    C_list = []
-    D_list = []
-    P_list = []
-
-    # Loop over every time step
-    for theta2, theta3 in zip(data["theta2"], data["theta3"]):
-
-        # Compute joint positions
-        A, B, C, D = joint_positions(
-            theta2, theta3, L1, L2, L3
-        )
-
-        # Compute coupler point position
-        # Default is at joint C
-        P = coupler_point(
-            B,
-            theta3,
-            r=coupler_ratio * L3,
-            phi=0.0
-        )
-
-        # Store results
-        A_list.append(A)
-        B_list.append(B)
-        C_list.append(C)
-        D_list.append(D)
-        P_list.append(P)
-
-    # Convert lists to NumPy arrays
+    theta2 = np.asarray(data["theta2"])
+    theta3 = np.asarray(data["theta3"])
+
+    # Trigonometric terms evaluated once for the whole sweep
+    # (reused from the solver when available)
+    if "cos_theta2" in data:
+        c2, s2 = data["cos_theta2"], data["sin_theta2"]
+    else:
+        c2, s2 = np.cos(theta2), np.sin(theta2)
+
+    if "cos_theta3" in data:
+        c3, s3 = data["cos_theta3"], data["sin_theta3"]
+    else:
+        c3, s3 = np.cos(theta3), np.sin(theta3)
+
+    # Input link (A -> B)
+    Bx = L2 * c2
+    By = L2 * s2
+
+    # Coupler link (B -> C)
+    Cx = Bx + L3 * c3
+    Cy = By + L3 * s3
+
+    # Coupler point along the coupler link
+    # Default is at joint C
+    r = coupler_ratio * L3
+    Px = Bx + r * c3
+    Py = By + r * s3
+
     return {
-        "A": np.array(A_list),
-        "B": np.array(B_list),
-        "C": np.array(C_list),
-        "D": np.array(D_list),
-        "P": np.array(P_list),
+        # Ground joints are fixed: stored once as (2,) points
+        "A": np.array([0.0, 0.0]),
+        "Bx": Bx,
+        "By": By,
+        "Cx": Cx,
+        "Cy": Cy,
+        "D": np.array([float(L1), 0.0]),
+        "Px": Px,
+        "Py": Py,
     }
@@ -0,0 +1,27 @@
+"""
+setup.py
+
+Builds the OPTIONAL compiled crank sweep (_fourbar.pyx).
+
+Usage:
+    python setup.py build_ext --inplace
+
+The application runs without it (NumPy fallback in solver.py).
+"""
+
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+
+extensions = [
+    Extension(
+        "_fourbar",
+        ["_fourbar.pyx"],
+        extra_compile_args=["-O3", "-ffast-math"],
+    )
+]
+
+setup(
+    name="fourbar-extensions",
+    ext_modules=cythonize(extensions),
+)
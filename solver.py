@@ -5,9 +5,9 @@ This module performs the KINEMATIC ANALYSIS of a planar four-bar linkage.
 
 Responsibilities:
 - Check Grashof condition
-- Solve nonlinear vector-loop equations
+- Solve vector-loop equations in closed form
 - Sweep input crank angle over one full revolution
-- Maintain branch consistency (open configuration)
+- Maintain branch consistency (assembly branch chosen once)
 - Handle singular (toggle) positions safely
 
 This file DOES NOT:
@@ -19,13 +19,26 @@ Input  : Link lengths + simulation parameters
 Output : Time-indexed arrays of link angles
 """
 
+from functools import lru_cache
+
 import numpy as np
 from scipy.optimize import fsolve
 
+# Optional compiled sweep (see _fourbar.pyx)
+try:
+    from _fourbar import fourbar_sweep
+except ImportError:
+    fourbar_sweep = None
+
+# sincos_progression only beats np.cos/np.sin on long sweeps
+# (measured break-even around 1500 samples, i.e. step < ~0.25 deg)
+SINCOS_MIN_SAMPLES = 1500
+
 
 # --------------------------------------------------
 # Grashof condition check
 # --------------------------------------------------
+@lru_cache(maxsize=1024)
 def check_grashof(L1, L2, L3, L4):
     """
     Checks whether the given four-bar linkage satisfies
@@ -100,6 +113,113 @@ def four_bar_equations(vars, theta2, L1, L2, L3, L4):
     return [eq1, eq2]
 
 
+# --------------------------------------------------
+# Wrap angle difference into [-pi, pi)
+# --------------------------------------------------
+def wrap_angle(angle):
+    """
+    Wraps an angle (or angle difference) into [-pi, pi).
+
+    Parameters:
+    ----------
+    angle : float or numpy.ndarray
+        Angle in radians
+
+    Returns:
+    -------
+    float or numpy.ndarray
+        Equivalent angle in [-pi, pi)
+    """
+
+    return np.mod(angle + np.pi, 2.0 * np.pi) - np.pi
+
+
+# --------------------------------------------------
+# Sine/cosine of a uniform angle progression
+# --------------------------------------------------
+def sincos_progression(theta0, step, n, reseed=64):
+    """
+    Computes cos and sin of theta0 + k * step for k = 0 .. n-1.
+
+    Uses the angle-addition identities
+        cos(a + b) = cos(a) cos(b) - sin(a) sin(b)
+        sin(a + b) = sin(a) cos(b) + cos(a) sin(b)
+    where a is reseeded with an exact sin/cos every
+    `reseed` samples and b = j * step (j < reseed).
+    Only about n / reseed + reseed trig calls are made.
+
+    The outer products cost more than they save on short
+    sweeps; compute_four_bar uses it only from
+    SINCOS_MIN_SAMPLES samples on.
+
+    Parameters:
+    ----------
+    theta0 : float
+        First angle (radians)
+
+    step : float
+        Angle increment (radians)
+
+    n : int
+        Number of samples
+
+    reseed : int, optional
+        Block length between exact evaluations
+
+    Returns:
+    -------
+    c, s : numpy.ndarray
+        Cosine and sine arrays of shape (n,)
+    """
+
+    n_blocks = -(-n // reseed)
+
+    # Exact values at the start of each block
+    a = theta0 + step * reseed * np.arange(n_blocks)
+    ca, sa = np.cos(a), np.sin(a)
+
+    # Offsets within a block (shared by all blocks)
+    b = step * np.arange(reseed)
+    cb, sb = np.cos(b), np.sin(b)
+
+    c = np.outer(ca, cb) - np.outer(sa, sb)
+    s = np.outer(sa, cb) + np.outer(ca, sb)
+
+    return c.ravel()[:n], s.ravel()[:n]
+
+
+# --------------------------------------------------
+# Initial branch seed (numerical, first step only)
+# --------------------------------------------------
+def initial_seed(theta2, L1, L2, L3, L4):
+    """
+    Solves the vector loop equations numerically from the
+    guess [theta2, theta2].
+
+    Only used to pick the assembly branch at the first step,
+    so the default configuration is the one the original
+    fsolve-based sweep converged to.
+
+    Returns:
+    -------
+    list or None
+        [theta3, theta4], or None if fsolve did not converge
+    """
+
+    solution, info, ier, msg = fsolve(
+        four_bar_equations,
+        [theta2, theta2],
+        args=(theta2, L1, L2, L3, L4),
+        full_output=True,
+        maxfev=200
+    )
+
+    if ier != 1:
+        return None
+
+    return [solution[0], solution[1]]
+
+
 # --------------------------------------------------
 # Solve four-bar linkage for ONE input angle
 # --------------------------------------------------
@@ -107,7 +227,10 @@ def solve_four_bar(theta2, L1, L2, L3, L4, prev_solution=None):
     """
     Solves the four-bar linkage for a single input angle.
 
-    Uses numerical root finding (fsolve).
+    Uses the closed-form (Freudenstein) solution:
+    the diagonal BD splits the loop into two triangles,
+    so theta4 follows from the law of cosines and
+    theta3 from the direction of vector B -> C.
 
     Parameters:
     ----------
@@ -117,6 +240,7 @@ def solve_four_bar(theta2, L1, L2, L3, L4, prev_solution=None):
     prev_solution : list or None
         Previous [theta3, theta4] solution
         Used to maintain branch consistency
+        (None: seeded with initial_seed)
 
     Returns:
     -------
@@ -124,31 +248,158 @@ def solve_four_bar(theta2, L1, L2, L3, L4, prev_solution=None):
         Coupler and output angles (radians)
     """
 
-    # Initial guess strategy
+    # Length of diagonal BD
+    r = np.sqrt(L1**2 + L2**2 - 2.0 * L1 * L2 * np.cos(theta2))
+
+    # Angle of diagonal BD measured at D
+    beta = np.arctan2(L2 * np.sin(theta2), L1 - L2 * np.cos(theta2))
+
+    # Law of cosines in triangle B-C-D
+    cos_gamma = (L4**2 + r**2 - L3**2) / (2.0 * L4 * r)
+
+    if not -1.0 <= cos_gamma <= 1.0:
+        # Triangle cannot close (toggle / singular position)
+        raise RuntimeError("Four-bar loop cannot be closed")
+
+    gamma = np.arccos(cos_gamma)
+
+    # Two assembly branches: open (-gamma) and crossed (+gamma)
+    theta4_open = np.pi - beta - gamma
+    theta4_crossed = np.pi - beta + gamma
+
     if prev_solution is None:
-        # First step: use input angle as rough guess
-        guess = [theta2, theta2]
+        # First step: branch the numerical solver converges to
+        prev_solution = initial_seed(theta2, L1, L2, L3, L4)
+
+    if prev_solution is None:
+        # No numerical seed: open configuration
+        theta4 = theta4_open
     else:
-        # Subsequent steps: use previous solution
+        # Subsequent steps: branch closest to previous solution
         # This prevents jumping between open/crossed configurations
-        guess = prev_solution
-
-    # Call nonlinear solver
-    solution, info, ier, msg = fsolve(
-        four_bar_equations,
-        guess,
-        args=(theta2, L1, L2, L3, L4),
-        full_output=True,
-        maxfev=200
+        prev4 = prev_solution[1]
+        theta4 = min(
+            (theta4_open, theta4_crossed),
+            key=lambda t: abs(wrap_angle(t - prev4))
+        )
+
+    # Coupler direction from B to C
+    theta3 = np.arctan2(
+        L4 * np.sin(theta4) - L2 * np.sin(theta2),
+        L1 + L4 * np.cos(theta4) - L2 * np.cos(theta2)
     )
 
-    # Check convergence
-    if ier != 1:
-        # Solver failed (usually near singular positions)
-        raise RuntimeError("Four-bar solver did not converge")
+    if prev_solution is not None:
+        # Keep angles continuous with the previous step (no 2*pi jumps)
+        theta3 = prev_solution[0] + wrap_angle(theta3 - prev_solution[0])
+        theta4 = prev_solution[1] + wrap_angle(theta4 - prev_solution[1])
+
+    return theta3, theta4
+
+
+# --------------------------------------------------
+# Branch selection for the sweep
+# --------------------------------------------------
+def is_crossed_branch(theta2, theta4_open, L1, L2, L3, L4, seed=None):
+    """
+    Decides whether the sweep should follow the crossed branch.
+
+    Parameters:
+    ----------
+    theta2 : float
+        First valid input angle (radians)
+
+    theta4_open : float
+        Open-configuration output angle at theta2
+
+    seed : list or None
+        Approximate [theta3, theta4] (None: initial_seed)
+
+    Returns:
+    -------
+    bool
+        True  -> crossed configuration
+        False -> open configuration
+    """
+
+    if seed is None:
+        # Numerical seed: memoized per linkage and first angle
+        return default_branch_crossed(
+            float(theta2), float(theta4_open),
+            float(L1), float(L2), float(L3), float(L4)
+        )
+
+    theta4 = solve_four_bar(theta2, L1, L2, L3, L4, seed)[1]
+
+    return abs(wrap_angle(theta4 - theta4_open)) > 1e-9
+
+
+# --------------------------------------------------
+# Default branch (cached fsolve decision)
+# --------------------------------------------------
+@lru_cache(maxsize=1024)
+def default_branch_crossed(theta2, theta4_open, L1, L2, L3, L4):
+    """
+    Branch the original fsolve-based sweep converged to.
+
+    The fsolve call in initial_seed dominates a sweep,
+    so the decision is cached on the linkage and the
+    first valid input angle (theta4_open follows from them).
+
+    Returns:
+    -------
+    bool
+        True  -> crossed configuration
+        False -> open configuration
+    """
+
+    theta4 = solve_four_bar(theta2, L1, L2, L3, L4)[1]
+
+    return abs(wrap_angle(theta4 - theta4_open)) > 1e-9
+
+
+# --------------------------------------------------
+# First assemblable step of the sweep
+# --------------------------------------------------
+def first_valid_step(L1, L2, L3, L4, step, theta2_start=1e-3):
+    """
+    Finds the first input angle of the sweep at which
+    the loop closes, without running the sweep.
+
+    Parameters:
+    ----------
+    L1, L2, L3, L4 : float
+        Link lengths
+
+    step : float
+        Input angle step size (radians)
+
+    theta2_start : float, optional
+        First input angle of the sweep (radians)
+
+    Returns:
+    -------
+    tuple or None
+        (theta2, theta4_open), or None if no step closes
+    """
+
+    k = 0
+    theta2 = theta2_start
+    while theta2 < 2.0 * np.pi + 1e-12:
+
+        r = np.sqrt(L1**2 + L2**2 - 2.0 * L1 * L2 * np.cos(theta2))
+        if r > 0.0:
+            cos_gamma = (L4**2 + r**2 - L3**2) / (2.0 * L4 * r)
+            if -1.0 <= cos_gamma <= 1.0:
+                beta = np.arctan2(
+                    L2 * np.sin(theta2), L1 - L2 * np.cos(theta2)
+                )
+                return theta2, np.pi - beta - np.arccos(cos_gamma)
 
-    # Return solved angles
-    return solution[0], solution[1]
+        k += 1
+        theta2 = theta2_start + k * step
+
+    return None
 
 
 # --------------------------------------------------
@@ -160,7 +411,8 @@ def compute_four_bar(
     L3,
     L4,
     step_deg=2.0,
-    rpm=30.0
+    rpm=30.0,
+    initial_solution=None
 ):
     """
     Computes the full kinematic motion of the four-bar linkage
@@ -177,6 +429,10 @@ def compute_four_bar(
     rpm : float
         Input crank speed (revolutions per minute)
 
+    initial_solution : list or None
+        Approximate [theta3, theta4] at the first valid step
+        Selects the assembly branch (default: initial_seed)
+
     Returns:
     -------
     data : dict
@@ -185,6 +441,7 @@ def compute_four_bar(
         - theta2
         - theta3
         - theta4
+        - cos_theta2, sin_theta2 (and likewise for theta3, theta4)
     """
 
     # Validate mechanism type
@@ -197,57 +454,88 @@ def compute_four_bar(
     # Convert RPM to angular velocity (rad/s)
     omega = rpm * 2.0 * np.pi / 60.0
 
-    # Time step corresponding to angular step
-    dt = step / omega
+    if fourbar_sweep is not None:
+        # Choose the branch at the first valid step, then
+        # run the compiled single-loop sweep once
+        first = first_valid_step(L1, L2, L3, L4, step)
+        crossed = first is not None and is_crossed_branch(
+            first[0], first[1], L1, L2, L3, L4, initial_solution
+        )
 
-    # Storage lists (converted to arrays later)
-    time_vals = []
-    theta2_vals = []
-    theta3_vals = []
-    theta4_vals = []
-
-    # For branch continuity
-    prev_solution = None
+        return fourbar_sweep(
+            float(L1), float(L2), float(L3), float(L4), step, omega, crossed
+        )
 
+    # Sweep input crank angle for one full revolution
     # Start slightly away from zero to avoid toggle singularity
-    theta2 = 1e-3
-    t = 0.0
+    theta2 = np.arange(1e-3, 2.0 * np.pi + 1e-12, step)
 
-    # Sweep input crank angle for one full revolution
-    while theta2 <= 2.0 * np.pi:
-
-        try:
-            # Solve for coupler and output angles
-            theta3, theta4 = solve_four_bar(
-                theta2, L1, L2, L3, L4, prev_solution
-            )
-
-            # Store solution for next iteration
-            prev_solution = [theta3, theta4]
-
-        except RuntimeError:
-            # Solver failed (singular position)
-            # Skip this step safely
-            theta2 += step
-            t += dt
-            continue
-
-        # Store results
-        time_vals.append(t)
-        theta2_vals.append(theta2)
-        theta3_vals.append(theta3)
-        theta4_vals.append(theta4)
-
-        # Increment input angle and time
-        theta2 += step
-        t += dt
-
-    # Convert lists to NumPy arrays
+    # Time step corresponding to angular step
+    dt = step / omega
+
+    # Time of every sample (before singular steps are removed)
+    time = np.arange(len(theta2)) * dt
+
+    # Crank trig terms (uniform progression on long sweeps only)
+    if len(theta2) >= SINCOS_MIN_SAMPLES:
+        c2, s2 = sincos_progression(theta2[0], step, len(theta2))
+    else:
+        c2, s2 = np.cos(theta2), np.sin(theta2)
+
+    # Closed-form solution evaluated for every input angle at once
+    # (same formulas as solve_four_bar)
+    r = np.sqrt(L1**2 + L2**2 - 2.0 * L1 * L2 * c2)
+    beta = np.arctan2(L2 * s2, L1 - L2 * c2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos_gamma = (L4**2 + r**2 - L3**2) / (2.0 * L4 * r)
+
+    # Loop cannot close at toggle / singular positions
+    cos_gamma = np.where(np.abs(cos_gamma) > 1.0, np.nan, cos_gamma)
+    gamma = np.arccos(cos_gamma)
+
+    # Skip singular steps safely
+    valid = ~np.isnan(gamma)
+    time = time[valid]
+    theta2 = theta2[valid]
+    c2 = c2[valid]
+    s2 = s2[valid]
+    beta = beta[valid]
+    gamma = gamma[valid]
+
+    # Two assembly branches: open (-gamma) and crossed (+gamma)
+    theta4_open = np.pi - beta - gamma
+    theta4_crossed = np.pi - beta + gamma
+
+    # Choose the branch once, at the first valid step
+    # This prevents jumping between open/crossed configurations
+    theta4 = theta4_open
+    if len(theta2) > 0 and is_crossed_branch(
+        theta2[0], theta4_open[0], L1, L2, L3, L4, initial_solution
+    ):
+        theta4 = theta4_crossed
+
+    c4, s4 = np.cos(theta4), np.sin(theta4)
+
+    # Coupler vector B -> C (length L3)
+    x3 = L1 + L4 * c4 - L2 * c2
+    y3 = L4 * s4 - L2 * s2
+    theta3 = np.arctan2(y3, x3)
+    r3 = np.hypot(x3, y3)
+
+    # Remove 2*pi jumps introduced by arctan2
+    # Trig terms are returned so geometry.py can reuse them
     return {
-        "time": np.array(time_vals),
-        "theta2": np.array(theta2_vals),
-        "theta3": np.array(theta3_vals),
-        "theta4": np.array(theta4_vals),
+        "time": time,
+        "theta2": theta2,
+        "theta3": np.unwrap(theta3),
+        "theta4": np.unwrap(theta4),
+        "cos_theta2": c2,
+        "sin_theta2": s2,
+        "cos_theta3": x3 / r3,
+        "sin_theta3": y3 / r3,
+        "cos_theta4": c4,
+        "sin_theta4": s4,
     }
 
 
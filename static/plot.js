@@ -15,6 +15,11 @@ async function runAnimation() {
 
     const data = await response.json();
 
+    if (!response.ok) {
+        alert("Cannot simulate this linkage: " + data.error);
+        return;
+    }
+
     const frames = [];
 
     // -----------------------------
@@ -23,10 +28,9 @@ async function runAnimation() {
     const allX = [];
     const allY = [];
 
-    data.A.forEach(p => { allX.push(p[0]); allY.push(p[1]); });
-    data.B.forEach(p => { allX.push(p[0]); allY.push(p[1]); });
-    data.C.forEach(p => { allX.push(p[0]); allY.push(p[1]); });
-    data.D.forEach(p => { allX.push(p[0]); allY.push(p[1]); });
+    // Ground joints A and D are fixed points
+    allX.push(data.A[0], ...data.Bx, ...data.Cx, data.D[0]);
+    allY.push(data.A[1], ...data.By, ...data.Cy, data.D[1]);
 
     const xmin = Math.min(...allX);
     const xmax = Math.max(...allX);
@@ -41,21 +45,21 @@ async function runAnimation() {
     // -----------------------------
     // Build animation frames
     // -----------------------------
-    for (let i = 0; i < data.A.length; i++) {
+    for (let i = 0; i < data.time.length; i++) {
 
         frames.push({
             data: [
                 // Four-bar linkage
                 {
                     x: [
-                        data.A[i][0], data.B[i][0],
-                        data.C[i][0], data.D[i][0],
-                        data.A[i][0]
+                        data.A[0], data.Bx[i],
+                        data.Cx[i], data.D[0],
+                        data.A[0]
                     ],
                     y: [
-                        data.A[i][1], data.B[i][1],
-                        data.C[i][1], data.D[i][1],
-                        data.A[i][1]
+                        data.A[1], data.By[i],
+                        data.Cy[i], data.D[1],
+                        data.A[1]
                     ],
                     mode: "lines+markers",
                     line: { width: 3 },
@@ -65,12 +69,12 @@ async function runAnimation() {
                 // Joint labels
                 {
                     x: [
-                        data.A[i][0], data.B[i][0],
-                        data.C[i][0], data.D[i][0]
+                        data.A[0], data.Bx[i],
+                        data.Cx[i], data.D[0]
                     ],
                     y: [
-                        data.A[i][1], data.B[i][1],
-                        data.C[i][1], data.D[i][1]
+                        data.A[1], data.By[i],
+                        data.Cy[i], data.D[1]
                     ],
                     mode: "text",
                     text: ["A", "B", "C", "D"],
@@ -80,8 +84,8 @@ async function runAnimation() {
 
                 // Workspace trail (output link point C)
                 {
-                    x: data.C.slice(0, i + 1).map(p => p[0]),
-                    y: data.C.slice(0, i + 1).map(p => p[1]),
+                    x: data.Cx.slice(0, i + 1),
+                    y: data.Cy.slice(0, i + 1),
                     mode: "lines",
                     line: { width: 2, dash: "dot" },
                     name: "Workspace"
@@ -0,0 +1,244 @@
+"""
+test_dynamics.py
+
+Checks the fixed-step differencing kernels against the
+adaptive Richardson reference (compute_velocity_adaptive)
+on real four-bar sweeps.
+
+Run with:
+    python -m pytest -q
+"""
+
+import numpy as np
+import pytest
+
+import solver
+from solver import compute_four_bar, solve_four_bar
+from geometry import compute_geometry, joint_positions
+from dynamics import (
+    compute_acceleration,
+    compute_kinematics,
+    compute_velocity,
+    compute_velocity_adaptive,
+)
+
+
+RPM = 30.0
+
+# Crank-rocker (full rotation, uniform grid)
+UNIFORM = (4.0, 1.0, 3.0, 3.5)
+
+# Rocker driven as input: toggle steps are skipped (gapped grid)
+GAPPED = (1.0, 0.9, 0.3, 0.8)
+
+
+# --------------------------------------------------
+# Helpers
+# --------------------------------------------------
+def sweep(links, step_deg=1.0, rpm=RPM):
+    """
+    Runs solver + geometry and returns (data, geometry).
+    """
+
+    data = compute_four_bar(*links, step_deg=step_deg, rpm=rpm)
+    geom = compute_geometry(data, *links[:3])
+
+    return data, geom
+
+
+def coupler_position_fn(data, links):
+    """
+    Coupler point P (joint C) as a function of time,
+    solved point by point on the same branch as the sweep.
+    """
+
+    L1, L2, L3, L4 = links
+    omega = RPM * 2.0 * np.pi / 60.0
+
+    def pos_fn(t):
+        # Nearest sweep sample seeds the branch
+        idx = np.clip(
+            np.searchsorted(data["time"], t), 0, len(data["time"]) - 1
+        )
+
+        pos = np.empty((len(t), 2))
+        for k, (tk, i) in enumerate(zip(t, idx)):
+            theta2 = data["theta2"][0] + omega * (tk - data["time"][0])
+            prev = [data["theta3"][i], data["theta4"][i]]
+            theta3, _ = solve_four_bar(theta2, L1, L2, L3, L4, prev)
+            pos[k] = joint_positions(theta2, theta3, L1, L2, L3)[2]
+
+        return pos
+
+    return pos_fn
+
+
+def segment_interior(time, margin=1):
+    """
+    Indices at least `margin` uniform steps away from
+    either end of their contiguous segment.
+    """
+
+    dt = np.diff(time)
+    uniform = np.isclose(dt, dt.min())
+
+    # Steps i-margin .. i+margin-1 must all be uniform
+    window = np.ones(2 * margin)
+    ok = np.convolve(uniform, window, mode="valid") == 2 * margin
+
+    return np.nonzero(ok)[0] + margin
+
+
+# --------------------------------------------------
+# NumPy kernel
+# --------------------------------------------------
+def test_fused_velocity_matches_adaptive_reference():
+    data, geom = sweep(UNIFORM)
+    kin = compute_kinematics(geom["Px"], geom["Py"], data["time"])
+
+    idx = segment_interior(data["time"])
+    ref, err = compute_velocity_adaptive(
+        coupler_position_fn(data, UNIFORM), data["time"][idx]
+    )
+
+    vel = np.column_stack((kin["vx"], kin["vy"]))[idx]
+    scale = np.abs(ref).max()
+
+    assert err.max() < 1e-6 * scale
+    np.testing.assert_allclose(vel, ref, atol=1e-3 * scale)
+
+
+@pytest.mark.parametrize("rpm", [RPM, 1e10])
+def test_gapped_sweep_uses_actual_spacing(rpm):
+    data, geom = sweep(GAPPED, rpm=rpm)
+    time = data["time"]
+
+    # Toggle steps were skipped: the grid is not uniform
+    assert np.diff(time).max() > 10 * np.diff(time).min()
+
+    kin = compute_kinematics(geom["Px"], geom["Py"], time)
+
+    pos = np.column_stack((geom["Px"], geom["Py"]))
+    vel = compute_velocity(pos, time)
+    acc = compute_acceleration(vel, time)
+
+    np.testing.assert_allclose(kin["vx"], vel[:, 0])
+    np.testing.assert_allclose(kin["vy"], vel[:, 1])
+    np.testing.assert_allclose(kin["ax"], acc[:, 0])
+    np.testing.assert_allclose(kin["ay"], acc[:, 1])
+
+    if rpm != RPM:
+        return
+
+    # Away from the gap the result stays close to the reference
+    # (looser bound: motion changes fast near the toggle positions)
+    idx = segment_interior(time, margin=10)
+    ref, _ = compute_velocity_adaptive(
+        coupler_position_fn(data, GAPPED), time[idx]
+    )
+    scale = np.abs(ref).max()
+    np.testing.assert_allclose(vel[idx], ref, atol=1e-2 * scale)
+
+
+def test_short_sweeps_do_not_crash():
+    data, geom = sweep((4.0, 5.0, 5.0, 4.9), step_deg=180.0)
+    assert len(data["time"]) == 2
+
+    kin = compute_kinematics(geom["Px"], geom["Py"], data["time"])
+    for key in ("vx", "vy", "ax", "ay"):
+        assert np.all(np.isfinite(kin[key]))
+
+    kin = compute_kinematics(
+        np.array([1.0]), np.array([2.0]), np.array([0.0])
+    )
+    for key in ("vx", "vy", "ax", "ay"):
+        np.testing.assert_array_equal(kin[key], [0.0])
+
+
+# --------------------------------------------------
+# Compiled sweep (optional)
+# --------------------------------------------------
+def other_branch_seed(data, links):
+    """
+    Approximate [theta3, theta4] on the branch the default
+    sweep did NOT follow (mirror of theta4 about BD).
+    """
+
+    L1, L2, L3, L4 = links
+    theta2 = data["theta2"][0]
+    beta = np.arctan2(L2 * np.sin(theta2), L1 - L2 * np.cos(theta2))
+
+    return [data["theta3"][0], 2.0 * (np.pi - beta) - data["theta4"][0]]
+
+
+@pytest.mark.parametrize(
+    "links, other_branch",
+    [(UNIFORM, False), (UNIFORM, True), (GAPPED, False), (GAPPED, True)],
+)
+def test_compiled_sweep_matches_numpy(monkeypatch, links, other_branch):
+    if solver.fourbar_sweep is None:
+        pytest.skip("_fourbar extension not built")
+
+    seed = None
+    if other_branch:
+        seed = other_branch_seed(compute_four_bar(*links, step_deg=1.0), links)
+
+    fast = compute_four_bar(*links, step_deg=1.0, initial_solution=seed)
+
+    monkeypatch.setattr(solver, "fourbar_sweep", None)
+    ref = compute_four_bar(*links, step_deg=1.0, initial_solution=seed)
+
+    assert fast.keys() == ref.keys()
+    for key in ref:
+        np.testing.assert_allclose(fast[key], ref[key], atol=1e-9)
+
+
+# --------------------------------------------------
+# Compiled kernel (optional)
+# --------------------------------------------------
+def test_compiled_kernel_matches_adaptive_reference():
+    dynamics_fast = pytest.importorskip("dynamics_fast")
+
+    data, _ = sweep(UNIFORM)
+    time = data["time"]
+
+    out = dynamics_fast.compute_all(
+        data["theta2"], data["theta3"], *UNIFORM[:3], time[1] - time[0]
+    )
+    vel = np.column_stack((out[6], out[7]))
+
+    idx = segment_interior(time)
+    ref, _ = compute_velocity_adaptive(
+        coupler_position_fn(data, UNIFORM), time[idx]
+    )
+    scale = np.abs(ref).max()
+    np.testing.assert_allclose(vel[idx], ref, atol=1e-3 * scale)
+
+
+@pytest.mark.parametrize(
+    "links, step_deg, rpm",
+    [
+        (UNIFORM, 1.0, RPM),
+        (GAPPED, 1.0, RPM),
+        (GAPPED, 1.0, 1e10),
+        ((4.0, 5.0, 5.0, 4.9), 180.0, RPM),
+    ],
+)
+def test_compiled_pipeline_matches_numpy(links, step_deg, rpm):
+    dynamics_fast = pytest.importorskip("dynamics_fast")
+
+    data, geom = sweep(links, step_deg, rpm)
+    kin = compute_kinematics(geom["Px"], geom["Py"], data["time"])
+
+    geom_fast, kin_fast = dynamics_fast.compute_geometry_kinematics(
+        data, *links[:3]
+    )
+
+    for key in ("Bx", "By", "Cx", "Cy", "Px", "Py"):
+        np.testing.assert_allclose(geom_fast[key], geom[key], atol=1e-12)
+
+    for key in ("vx", "vy", "ax", "ay"):
+        scale = np.abs(kin[key]).max()
+        np.testing.assert_allclose(
+            kin_fast[key], kin[key], atol=1e-9 * scale
+        )